@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+ADR Analyzer Daemon
+
+This script keeps codebase analysis results, git history and the ADR catalog
+warm in a long-running process and answers requests over a Unix domain socket.
+The same script acts as a thin client, so editors and agents can query the
+daemon without paying interpreter startup plus a cold scan on every call.
+"""
+
+import os
+import sys
+import json
+import stat
+import socket
+import hashlib
+import argparse
+import tempfile
+import threading
+import socketserver
+import subprocess
+from pathlib import Path
+from typing import Any, Dict
+
+from analyze_codebase import CodebaseAnalyzer
+from fs_watch import FileWatcher
+from generate_adr import ADRGenerator
+
+
+def default_socket_dir() -> str:
+    """Get the per-user directory holding default sockets."""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"adr-writer-{os.getuid()}")
+
+
+def default_socket_path(repo_path: str = ".") -> str:
+    """Get the default socket path for a repository, unique per user and resolved path."""
+    digest = hashlib.sha256(str(Path(repo_path).resolve()).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(default_socket_dir(), f"{digest}.sock")
+
+
+def ensure_private_dir(path: str):
+    """Create a 0700 directory, refusing one another user owns or others can enter."""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise RuntimeError(f"{path} is not a directory owned by the current user")
+    if info.st_mode & 0o077:
+        raise RuntimeError(f"{path} is accessible to other users; remove it or run chmod 700")
+
+
+class AnalyzerIndex:
+    """Caches analyzer and ADR results between requests."""
+
+    def __init__(self, repo_path: str = ".", adr_dir: str = "docs/adr"):
+        self.repo_path = Path(repo_path).resolve()
+        # Relative ADR directories live inside the served repository, not the daemon's cwd
+        self.adr_dir = self.repo_path / adr_dir
+        self.analyzer = CodebaseAnalyzer(str(self.repo_path))
+        self.generator = ADRGenerator(str(self.adr_dir))
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._generation = 0
+        self._scans = {}
+        self._history = {}
+        self._history_head = None
+        self._validation = {}
+
+    def refresh(self) -> Dict[str, Any]:
+        """Drop all cached results so the next request rescans."""
+        with self._lock:
+            self._generation += 1
+            self._scans.clear()
+            self._history.clear()
+            self._history_head = None
+            self._validation.clear()
+        return {'refreshed': True}
+
+    def invalidate_scans(self):
+        """Drop cached file scans and the ADR catalog after watched files changed."""
+        with self._lock:
+            self._generation += 1
+            self._scans.clear()
+
+    def start_watching(self) -> threading.Thread:
+        """Invalidate cached scans and the ADR catalog whenever watched files change."""
+        roots = [str(self.repo_path)]
+        if self.repo_path not in self.adr_dir.parents:
+            roots.append(str(self.adr_dir))
+
+        # Watches exist before the first request is served, so nothing cached can miss a change
+        watcher = FileWatcher(roots)
+        watcher.start()
+
+        def run():
+            for _ in watcher.changes():
+                self.invalidate_scans()
+
+        thread = threading.Thread(target=run, name="adr-index-watcher", daemon=True)
+        thread.start()
+        return thread
+
+    def _key_lock(self, key) -> threading.Lock:
+        """Get the lock serializing computation of a single cache entry."""
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _scan(self, name: str, compute):
+        """Return a cached scan result, computing it on first use.
+
+        The scan runs outside the index lock so a cold scan does not block
+        unrelated requests, and its result is discarded if the tree changed
+        while it was running.
+        """
+        with self._key_lock(('scan', name)):
+            with self._lock:
+                if name in self._scans:
+                    return self._scans[name]
+                generation = self._generation
+            result = compute()
+            with self._lock:
+                if generation == self._generation:
+                    self._scans[name] = result
+            return result
+
+    def stack(self) -> Dict[str, list]:
+        """Get the cached technology stack."""
+        return self._scan('stack', self.analyzer.detect_technology_stack)
+
+    def files(self) -> Dict[str, list]:
+        """Get the cached file pattern findings."""
+        return self._scan('files', self.analyzer.analyze_file_patterns)
+
+    def patterns(self) -> list:
+        """Get the cached design patterns."""
+        return self._scan('patterns', self.analyzer.extract_design_patterns)
+
+    def _git_head(self) -> str:
+        """Get the current HEAD commit, used to invalidate cached history."""
+        try:
+            result = subprocess.run(['git', 'rev-parse', 'HEAD'],
+                                    cwd=self.analyzer.repo_path,
+                                    capture_output=True, text=True, check=True)
+            return result.stdout.strip()
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return ""
+
+    def history(self, file_pattern: str = "*", limit: int = 50) -> list:
+        """Get architectural commit history, cached until HEAD moves."""
+        head = self._git_head() if self.analyzer.git_available else ""
+        key = (file_pattern, limit)
+        with self._key_lock(('history', key)):
+            with self._lock:
+                if head != self._history_head:
+                    self._history.clear()
+                    self._history_head = head
+                if key in self._history:
+                    return self._history[key]
+            commits = self.analyzer.get_git_history(file_pattern, limit)
+            with self._lock:
+                if head == self._history_head:
+                    self._history[key] = commits
+            return commits
+
+    def draft(self, topic: str) -> str:
+        """Generate an ADR draft from the cached analysis."""
+        return self.analyzer.render_adr_draft(topic, self.files(), self.stack(), self.patterns())
+
+    def catalog(self) -> list:
+        """Get the cached ADR catalog."""
+        return self._scan('catalog', self.generator.list_adrs)
+
+    def list(self) -> list:
+        """List ADRs with JSON-friendly modification times."""
+        return [dict(adr, modified=adr['modified'].isoformat()) for adr in self.catalog()]
+
+    def validate(self, filepath: str = None) -> Dict[str, list]:
+        """Validate one or all ADRs, reusing results for unchanged files."""
+        if filepath:
+            paths = [filepath]
+        else:
+            paths = [adr['path'] for adr in self.catalog()]
+
+        results = {}
+        for path in paths:
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime = None
+            with self._lock:
+                cached = self._validation.get(path)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, self.generator.validate_adr(path))
+                with self._lock:
+                    self._validation[path] = cached
+            results[path] = cached[1]
+        return results
+
+    def handle(self, request: Dict[str, Any]) -> Any:
+        """Dispatch a decoded request to the matching handler."""
+        command = request.get('command')
+        if command == 'ping':
+            return {'pid': os.getpid(), 'path': str(self.repo_path),
+                    'adr_dir': str(self.adr_dir)}
+        if command == 'refresh':
+            return self.refresh()
+        if command == 'stack':
+            return self.stack()
+        if command == 'files':
+            return self.files()
+        if command == 'patterns':
+            return self.patterns()
+        if command == 'history':
+            return self.history(request.get('pattern', '*'), int(request.get('limit', 50)))
+        if command == 'draft':
+            if not request.get('topic'):
+                raise ValueError("topic is required for draft command")
+            return self.draft(request['topic'])
+        if command == 'list':
+            return self.list()
+        if command == 'validate':
+            return self.validate(request.get('file'))
+        raise ValueError(f"Unknown command: {command}")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads one JSON request per line and writes one JSON response per line."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            stop = False
+            try:
+                request = json.loads(line)
+                if request.get('command') == 'stop':
+                    stop = True
+                    response = {'ok': True, 'result': {'stopped': True}}
+                else:
+                    response = {'ok': True, 'result': self.server.index.handle(request)}
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+            self.wfile.flush()
+            if stop:
+                # Reply first: shutdown lets the process exit and kill this thread
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class AnalyzerServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server holding a warm AnalyzerIndex."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, index: AnalyzerIndex):
+        self.socket_path = socket_path
+        self.index = index
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+
+    def server_bind(self):
+        # Create the socket owner-only from the start rather than chmod-ing it after bind
+        old_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def _remove_stale_socket(socket_path: str):
+    """Remove a leftover socket file, refusing if a daemon still answers on it."""
+    if not os.path.exists(socket_path):
+        return
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(socket_path)
+        return
+    raise RuntimeError(f"A daemon is already listening on {socket_path}")
+
+
+def send_request(socket_path: str, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Send a single request to the daemon and return its decoded response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        with sock.makefile('r', encoding='utf-8') as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("Daemon closed the connection without a response")
+    return json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve ADR analysis from a warm in-memory index")
+    parser.add_argument("command",
+                       choices=["serve", "stop", "ping", "refresh", "stack", "files",
+                                "patterns", "history", "draft", "list", "validate"],
+                       help="Start the daemon or send it a request")
+    parser.add_argument("--socket",
+                       help="Unix domain socket path (default: derived from --path)")
+    parser.add_argument("--path", default=".",
+                       help="Path to codebase directory; selects the daemon to talk to")
+    parser.add_argument("--adr-dir", default="docs/adr",
+                       help="ADR directory, relative to --path unless absolute (for serve)")
+    parser.add_argument("--topic", help="Topic for ADR draft (for draft command)")
+    parser.add_argument("--file", help="File to validate (for validate command)")
+    parser.add_argument("--pattern", default="*", help="File pattern for history command")
+    parser.add_argument("--limit", type=int, default=50, help="Commit limit for history command")
+
+    args = parser.parse_args()
+    socket_path = args.socket or default_socket_path(args.path)
+
+    if args.command == "serve":
+        index = AnalyzerIndex(args.path, args.adr_dir)
+        try:
+            if not args.socket:
+                ensure_private_dir(default_socket_dir())
+            server = AnalyzerServer(socket_path, index)
+        except (RuntimeError, OSError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        index.start_watching()
+        print(f"Serving {index.repo_path} on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
+    request = {'command': args.command}
+    if args.command == "draft":
+        if not args.topic:
+            print("Error: --topic is required for draft command")
+            sys.exit(1)
+        request['topic'] = args.topic
+    elif args.command == "validate" and args.file:
+        # The daemon may run from another directory
+        request['file'] = os.path.abspath(args.file)
+    elif args.command == "history":
+        request['pattern'] = args.pattern
+        request['limit'] = args.limit
+
+    try:
+        response = send_request(socket_path, request)
+    except (ConnectionRefusedError, FileNotFoundError):
+        print(f"Error: no daemon listening on {socket_path} (start one with 'serve')")
+        sys.exit(1)
+    except ConnectionError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if not response.get('ok'):
+        print(f"Error: {response.get('error')}")
+        sys.exit(1)
+
+    result = response['result']
+    if args.command == "draft":
+        print(result)
+    else:
+        print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,13 +11,51 @@ import re
 import sys
 import argparse
 from pathlib import Path
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Set, Tuple
 import subprocess
 
+from fs_watch import FileWatcher, IGNORED_DIRS
+from record_writer import FORMATS, open_writer
+
 
 class CodebaseAnalyzer:
     """Analyzes codebase to infer architectural decisions."""
 
+    FILE_PATTERNS = {
+        'database': [
+            '**/*.sql', '**/migrations/**', '**/schema.sql',
+            '**/database/**', '**/db/**', '**/*model*.py'
+        ],
+        'api': [
+            '**/api/**', '**/routes/**', '**/controllers/**',
+            '**/*router*.py', '**/*endpoint*.py', '**/swagger/**'
+        ],
+        'config': [
+            '**/config/**', '**/*.env*', '**/settings/**',
+            '**/*config*.py', '**/properties/**'
+        ],
+        'infrastructure': [
+            '**/docker*', '**/k8s/**', '**/helm/**',
+            '**/terraform/**', '**/cloudformation/**'
+        ],
+        'authentication': [
+            '**/auth/**', '**/security/**', '**/*auth*.py',
+            '**/*login*.py', '**/*token*.py'
+        ]
+    }
+
+    DESIGN_PATTERN_INDICATORS = {
+        'MVC': ['**/models/**', '**/views/**', '**/controllers/**'],
+        'Repository': ['**/repositories/**', '**/*repository*.py'],
+        'Factory': ['**/*factory*.py', '**/factories/**'],
+        'Observer': ['**/*observer*.py', '**/*event*.py', '**/*listener*.py'],
+        'Singleton': ['**/*singleton*.py'],
+        'Strategy': ['**/*strategy*.py', '**/strategies/**'],
+        'Adapter': ['**/*adapter*.py', '**/adapters/**'],
+        'Proxy': ['**/*proxy*.py', '**/proxies/**']
+    }
+
     def __init__(self, repo_path: str = "."):
         self.repo_path = Path(repo_path)
         self.git_available = self._check_git_available()
@@ -60,40 +98,19 @@ class CodebaseAnalyzer:
 
     def analyze_file_patterns(self) -> Dict[str, List[str]]:
         """Analyze file patterns to infer architectural decisions."""
+        return dict(self.iter_file_patterns())
 
-        patterns = {
-            'database': [
-                '**/*.sql', '**/migrations/**', '**/schema.sql',
-                '**/database/**', '**/db/**', '**/*model*.py'
-            ],
-            'api': [
-                '**/api/**', '**/routes/**', '**/controllers/**',
-                '**/*router*.py', '**/*endpoint*.py', '**/swagger/**'
-            ],
-            'config': [
-                '**/config/**', '**/*.env*', '**/settings/**',
-                '**/*config*.py', '**/properties/**'
-            ],
-            'infrastructure': [
-                '**/docker*', '**/k8s/**', '**/helm/**',
-                '**/terraform/**', '**/cloudformation/**'
-            ],
-            'authentication': [
-                '**/auth/**', '**/security/**', '**/*auth*.py',
-                '**/*login*.py', '**/*token*.py'
-            ]
-        }
-
-        findings = {}
+    def iter_file_patterns(self, labels_by_path: Dict[str, Set[Tuple[str, str]]] = None
+                           ) -> Iterator[Tuple[str, List[str]]]:
+        """Yield (category, files) pairs from a single walk of the repository.
 
-        for category, file_patterns in patterns.items():
-            findings[category] = []
-            for pattern in file_patterns:
-                files = list(self.repo_path.glob(pattern))
-                findings[category].extend([str(f.relative_to(self.repo_path))
-                                         for f in files if f.is_file()])
-
-        return findings
+        Pass the result of ``classify_files`` to reuse an existing walk.
+        """
+        if labels_by_path is None:
+            labels_by_path = self.classify_files()
+        for category in self.FILE_PATTERNS:
+            yield category, [path for path, labels in labels_by_path.items()
+                             if ('category', category) in labels]
 
     def detect_technology_stack(self) -> Dict[str, List[str]]:
         """Detect the technology stack from files and dependencies."""
@@ -172,32 +189,139 @@ class CodebaseAnalyzer:
 
     def extract_design_patterns(self) -> List[Dict[str, str]]:
         """Extract design patterns from code structure."""
+        return list(self.iter_design_patterns())
 
-        patterns = []
+    def iter_design_patterns(self, labels_by_path: Dict[str, Set[Tuple[str, str]]] = None
+                             ) -> Iterator[Dict[str, Any]]:
+        """Yield design pattern findings from a single walk of the repository.
 
-        # Look for common design patterns in file structure
-        pattern_indicators = {
-            'MVC': ['**/models/**', '**/views/**', '**/controllers/**'],
-            'Repository': ['**/repositories/**', '**/*repository*.py'],
-            'Factory': ['**/*factory*.py', '**/factories/**'],
-            'Observer': ['**/*observer*.py', '**/*event*.py', '**/*listener*.py'],
-            'Singleton': ['**/*singleton*.py'],
-            'Strategy': ['**/*strategy*.py', '**/strategies/**'],
-            'Adapter': ['**/*adapter*.py', '**/adapters/**'],
-            'Proxy': ['**/*proxy*.py', '**/proxies/**']
-        }
+        Pass the result of ``classify_files`` to reuse an existing walk.
+        """
+        if labels_by_path is None:
+            labels_by_path = self.classify_files()
 
-        for pattern, file_patterns in pattern_indicators.items():
-            for pattern_file in file_patterns:
-                files = list(self.repo_path.glob(pattern_file))
-                if files:
-                    patterns.append({
-                        'pattern': pattern,
-                        'files': [str(f.relative_to(self.repo_path)) for f in files],
-                        'description': self._get_pattern_description(pattern)
-                    })
-
-        return patterns
+        # Look for common design patterns in file structure
+        for pattern in self.DESIGN_PATTERN_INDICATORS:
+            files = [path for path, labels in labels_by_path.items()
+                     if ('pattern', pattern) in labels]
+            if files:
+                yield {
+                    'pattern': pattern,
+                    'files': files,
+                    'description': self._get_pattern_description(pattern)
+                }
+
+    def iter_repo_files(self) -> Iterator[str]:
+        """Yield repository files relative to the root, skipping VCS and dependency directories."""
+        for dirpath, dirnames, filenames in os.walk(self.repo_path):
+            dirnames[:] = sorted(d for d in dirnames if d not in IGNORED_DIRS)
+            for filename in sorted(filenames):
+                path = Path(dirpath) / filename
+                if path.is_file():
+                    yield path.relative_to(self.repo_path).as_posix()
+
+    def classify_files(self) -> Dict[str, Set[Tuple[str, str]]]:
+        """Classify every repository file, keeping only files with at least one label."""
+        labels_by_path = {}
+        for rel_path in self.iter_repo_files():
+            labels = self.classify_path(rel_path)
+            if labels:
+                labels_by_path[rel_path] = set(labels)
+        return labels_by_path
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _glob_to_regex(pattern: str) -> "re.Pattern":
+        """Compile a glob pattern into a regex matching relative file paths.
+
+        A trailing ``**`` matches every file below the directory, so
+        ``**/api/**`` classifies the files inside any ``api`` directory.
+        """
+        parts = pattern.split('/')
+        regex = ''
+        for i, part in enumerate(parts):
+            last = i == len(parts) - 1
+            if part == '**':
+                regex += '.+' if last else '(?:[^/]+/)*'
+                continue
+            for char in part:
+                if char == '*':
+                    regex += '[^/]*'
+                elif char == '?':
+                    regex += '[^/]'
+                else:
+                    regex += re.escape(char)
+            if not last:
+                regex += '/'
+        return re.compile(regex + r'\Z')
+
+    def classify_path(self, rel_path: str) -> List[Tuple[str, str]]:
+        """Classify a single relative file path into categories and design patterns."""
+        labels = []
+        for category, file_patterns in self.FILE_PATTERNS.items():
+            if any(self._glob_to_regex(p).match(rel_path) for p in file_patterns):
+                labels.append(('category', category))
+        for pattern, file_patterns in self.DESIGN_PATTERN_INDICATORS.items():
+            if any(self._glob_to_regex(p).match(rel_path) for p in file_patterns):
+                labels.append(('pattern', pattern))
+        return labels
+
+    def _relative(self, path: Path) -> str:
+        """Get a watched path relative to the repository root."""
+        return path.relative_to(self.repo_path.resolve()).as_posix()
+
+    def create_watcher(self) -> FileWatcher:
+        """Create and start a watcher for the repository.
+
+        Start it before taking the baseline passed to ``watch`` so that changes
+        made while the baseline is scanned are still reported.
+        """
+        watcher = FileWatcher([str(self.repo_path)])
+        watcher.start()
+        return watcher
+
+    def watch(self, watcher: FileWatcher = None,
+              baseline: Dict[str, Set[Tuple[str, str]]] = None) -> Iterator[Dict[str, Any]]:
+        """Watch the repository and yield classification deltas as files change.
+
+        ``baseline`` is a ``classify_files`` result taken after ``watcher`` was
+        started; both are created here when omitted.
+        """
+        if watcher is None:
+            watcher = self.create_watcher()
+
+        # Same walk and matcher as the full scan, then updated one path at a time
+        labels_by_path = dict(baseline) if baseline is not None else self.classify_files()
+
+        for changed in watcher.changes():
+            if changed is None:
+                # Events were lost: diff a fresh walk against everything tracked
+                fresh = self.classify_files()
+                updates = {rel_path: fresh.get(rel_path, set())
+                           for rel_path in labels_by_path.keys() | fresh.keys()}
+            else:
+                updates = {}
+                for path in sorted(changed):
+                    rel_path = self._relative(path)
+                    if path.is_file():
+                        updates[rel_path] = set(self.classify_path(rel_path))
+                    else:
+                        # Removed file or directory: drop everything tracked under it
+                        for tracked in labels_by_path:
+                            if tracked == rel_path or tracked.startswith(rel_path + '/'):
+                                updates[tracked] = set()
+
+            for rel_path in sorted(updates):
+                labels = updates[rel_path]
+                old_labels = labels_by_path.get(rel_path, set())
+                for kind, name in sorted(labels - old_labels):
+                    yield {'change': 'added', 'kind': kind, 'name': name, 'file': rel_path}
+                for kind, name in sorted(old_labels - labels):
+                    yield {'change': 'removed', 'kind': kind, 'name': name, 'file': rel_path}
+                if labels:
+                    labels_by_path[rel_path] = labels
+                else:
+                    labels_by_path.pop(rel_path, None)
 
     def _get_pattern_description(self, pattern: str) -> str:
         """Get description for design pattern."""
@@ -220,7 +344,13 @@ class CodebaseAnalyzer:
         file_patterns = self.analyze_file_patterns()
         tech_stack = self.detect_technology_stack()
         design_patterns = self.extract_design_patterns()
-        git_history = self.get_git_history()
+
+        return self.render_adr_draft(topic, file_patterns, tech_stack, design_patterns)
+
+    def render_adr_draft(self, topic: str, file_patterns: Dict[str, List[str]],
+                         tech_stack: Dict[str, List[str]],
+                         design_patterns: List[Dict]) -> str:
+        """Render a draft ADR from precomputed analysis results."""
 
         # Generate the draft
         draft = f"""# {topic}
@@ -350,71 +480,149 @@ TODO: Document the final decision and rationale
             return {}
 
 
+def _render_commit_analysis(record: Dict[str, Any]) -> str:
+    return '\n'.join([
+        "Commit Analysis:",
+        f"Hash: {record['hash']}",
+        f"Message: {record['message']}",
+        f"Author: {record['author']}",
+        f"Date: {record['date']}",
+        f"Files changed: {', '.join(record['files_changed'])}",
+        f"Architectural: {record['is_architectural']}",
+    ])
+
+
+def _render_stack(record: Dict[str, Any]) -> str:
+    lines = [f"  {category.replace('_', ' ').title()}: {', '.join(items)}"
+             for category, items in record.items() if items and category != 'type']
+    return '\n'.join(lines) if lines else None
+
+
+def _render_file_list(label: str, files: List[str]) -> str:
+    lines = [f"  {label}: {len(files)} files"]
+    lines.extend(f"    - {file}" for file in files[:3])
+    if len(files) > 3:
+        lines.append(f"    ... and {len(files) - 3} more files")
+    return '\n'.join(lines)
+
+
+def _render_finding(record: Dict[str, Any]) -> str:
+    if not record['files']:
+        return None
+    return _render_file_list(record['category'].title(), record['files'])
+
+
+def _render_pattern(record: Dict[str, Any]) -> str:
+    return _render_file_list(record['pattern'], record['files'])
+
+
+def _render_draft(record: Dict[str, Any]) -> str:
+    if 'output' in record:
+        return f"ADR draft written to: {record['output']}"
+    return f"Generated ADR Draft:\n{'=' * 50}\n{record['content']}"
+
+
+def _render_delta(record: Dict[str, Any]) -> str:
+    sign = '+' if record['change'] == 'added' else '-'
+    label = record['name'] if record['kind'] == 'category' else f"{record['name']} pattern"
+    return f"{sign} [{label}] {record['file']}"
+
+
+TEXT_RENDERERS = {
+    'commit_analysis': _render_commit_analysis,
+    'stack': _render_stack,
+    'finding': _render_finding,
+    'pattern': _render_pattern,
+    'commit': lambda record: f"  {record['hash']}: {record['message']}",
+    'draft': _render_draft,
+    'delta': _render_delta,
+    'error': lambda record: record['message'],
+}
+
+
 def main():
     parser = argparse.ArgumentParser(description="Analyze codebase for ADR creation")
     parser.add_argument("--path", default=".", help="Path to codebase directory")
     parser.add_argument("--topic", help="Topic for ADR generation")
     parser.add_argument("--output", help="Output file for generated ADR")
-    parser.add_argument("--analyze", choices=['stack', 'patterns', 'history', 'all'],
+    parser.add_argument("--analyze", choices=['stack', 'files', 'patterns', 'history', 'all'],
                        default='all', help="What to analyze")
     parser.add_argument("--commit", help="Analyze specific commit")
+    parser.add_argument("--watch", action="store_true",
+                       help="After the initial analysis, report classification changes as files change")
+    parser.add_argument("--format", choices=FORMATS, default='text',
+                       help="Output format: human text, a JSON array, or JSON Lines records")
 
     args = parser.parse_args()
 
+    if args.watch and args.format == 'json':
+        parser.error("--watch never finishes, so its output cannot be one JSON array; use --format jsonl")
+
     analyzer = CodebaseAnalyzer(args.path)
 
+    with open_writer(args.format, TEXT_RENDERERS) as writer:
+        run_analysis(analyzer, args, writer)
+
+
+def run_analysis(analyzer: CodebaseAnalyzer, args, writer):
+    """Run the requested analysis, sending every result to the writer."""
     if args.commit:
         commit_info = analyzer.analyze_commit_message(args.commit)
         if commit_info:
-            print(f"Commit Analysis:")
-            print(f"Hash: {commit_info['hash']}")
-            print(f"Message: {commit_info['message']}")
-            print(f"Author: {commit_info['author']}")
-            print(f"Date: {commit_info['date']}")
-            print(f"Files changed: {', '.join(commit_info['files_changed'])}")
-            print(f"Architectural: {commit_info['is_architectural']}")
+            writer.write('commit_analysis', **commit_info)
         else:
-            print("Commit not found or git not available")
+            writer.write('error', message="Commit not found or git not available")
         return
 
+    # Start watching before anything is scanned so no change slips between the
+    # printed results and the first delta; the printed walk becomes the baseline
+    watcher = analyzer.create_watcher() if args.watch else None
+    labels_by_path = None
+    if args.watch or args.analyze in ['files', 'patterns', 'all']:
+        labels_by_path = analyzer.classify_files()
+
     if args.analyze in ['stack', 'all']:
-        print("Technology Stack Analysis:")
-        stack = analyzer.detect_technology_stack()
-        for category, items in stack.items():
-            if items:
-                print(f"  {category.replace('_', ' ').title()}: {', '.join(items)}")
-        print()
+        writer.message("Technology Stack Analysis:")
+        writer.write('stack', **analyzer.detect_technology_stack())
+        writer.message()
+
+    # File findings joined 'all' after its text layout was established; keep that
+    # layout stable and only include them for structured output or when asked for
+    if args.analyze == 'files' or (args.analyze == 'all' and args.format != 'text'):
+        writer.message("File Pattern Analysis:")
+        for category, files in analyzer.iter_file_patterns(labels_by_path):
+            writer.write('finding', category=category, files=files)
+        writer.message()
 
     if args.analyze in ['patterns', 'all']:
-        print("Design Patterns Analysis:")
-        patterns = analyzer.extract_design_patterns()
-        for pattern in patterns:
-            print(f"  {pattern['pattern']}: {len(pattern['files'])} files")
-            for file in pattern['files'][:3]:
-                print(f"    - {file}")
-            if len(pattern['files']) > 3:
-                print(f"    ... and {len(pattern['files']) - 3} more files")
-        print()
+        writer.message("Design Patterns Analysis:")
+        for pattern in analyzer.iter_design_patterns(labels_by_path):
+            writer.write('pattern', **pattern)
+        writer.message()
 
     if args.analyze in ['history', 'all']:
-        print("Architectural Commit History:")
-        history = analyzer.get_git_history()
-        for commit in history[:10]:
-            print(f"  {commit['hash']}: {commit['message']}")
-        print()
+        writer.message("Architectural Commit History:")
+        for commit in analyzer.get_git_history(limit=10):
+            writer.write('commit', **commit)
+        writer.message()
 
     if args.topic:
         draft = analyzer.generate_adr_draft(args.topic)
-
         if args.output:
             with open(args.output, 'w') as f:
                 f.write(draft)
-            print(f"ADR draft written to: {args.output}")
+            writer.write('draft', topic=args.topic, output=args.output)
         else:
-            print("Generated ADR Draft:")
-            print("=" * 50)
-            print(draft)
+            writer.write('draft', topic=args.topic, content=draft)
+
+    if args.watch:
+        writer.message(f"Watching {analyzer.repo_path.resolve()} for changes (Ctrl+C to stop)...")
+        try:
+            for delta in analyzer.watch(watcher, labels_by_path):
+                writer.write('delta', **delta)
+        except KeyboardInterrupt:
+            pass
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Filesystem Watcher for ADR Tooling
+
+This module reports batches of changed files under one or more directories.
+It uses Linux inotify through ctypes when available and falls back to
+comparing periodic stat snapshots on other platforms, or when the inotify
+watch limit is exhausted. A batch of ``None`` means events were lost and
+callers must rescan to resynchronize. Call ``start()`` before taking the
+baseline scan so that no change between the scan and the first event is lost.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_Q_OVERFLOW = 0x00004000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+
+EVENT_HEADER = struct.Struct('iIII')
+
+IGNORED_DIRS = {'.git', '.hg', '.svn', '__pycache__', 'node_modules', '.venv', 'venv'}
+
+
+class FileWatcher:
+    """Yields sets of changed paths under the watched directories."""
+
+    def __init__(self, roots: List[str], recursive: bool = True,
+                 poll_interval: float = 1.0, settle: float = 0.2):
+        self.roots = [Path(root).resolve() for root in roots]
+        self.recursive = recursive
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self._libc = self._load_inotify()
+        self._fd = None
+        self._watches = {}
+        self._started = False
+        self._previous = None
+
+    def _load_inotify(self):
+        """Load libc inotify functions, returning None if unsupported."""
+        libname = ctypes.util.find_library('c')
+        if not libname:
+            return None
+        try:
+            libc = ctypes.CDLL(libname, use_errno=True)
+            libc.inotify_init1
+            libc.inotify_add_watch
+        except (OSError, AttributeError):
+            return None
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether change events come from inotify rather than polling."""
+        return self._libc is not None
+
+    def _iter_dirs(self, root: Path) -> Iterator[Path]:
+        """Yield a directory and, when recursive, its watchable subdirectories."""
+        yield root
+        if not self.recursive:
+            return
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+            for dirname in dirnames:
+                yield Path(dirpath) / dirname
+
+    def iter_files(self, root: Path) -> Iterator[Path]:
+        """Yield files under a directory, honouring the recursive setting."""
+        if not root.is_dir():
+            return
+        for directory in self._iter_dirs(root):
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            yield Path(entry.path)
+            except OSError:
+                continue
+
+    def start(self):
+        """Begin recording changes; anything modified after this call is reported."""
+        if self._started:
+            return
+        self._started = True
+
+        if self.uses_inotify:
+            self._fd = self._libc.inotify_init1(IN_CLOEXEC)
+            if self._fd < 0:
+                self._fall_back_to_polling("inotify_init1 failed", ctypes.get_errno())
+                return
+            try:
+                for root in self.roots:
+                    for directory in self._iter_dirs(root):
+                        self._add_watch(directory)
+            except OSError as e:
+                self._fall_back_to_polling("cannot watch every directory", e.errno)
+                return
+        else:
+            self._previous = self._snapshot()
+
+    def _fall_back_to_polling(self, reason: str, err: int):
+        """Switch to stat polling rather than keep watching only part of the tree."""
+        print(f"Warning: {reason} ({os.strerror(err)}); falling back to polling every "
+              f"{self.poll_interval}s", file=sys.stderr)
+        if err == errno.ENOSPC:
+            print("  Raise fs.inotify.max_user_watches to use inotify for this tree",
+                  file=sys.stderr)
+        if self._fd is not None and self._fd >= 0:
+            os.close(self._fd)
+        self._fd = None
+        self._watches.clear()
+        self._libc = None
+        self._previous = self._snapshot()
+
+    def _add_watch(self, directory: Path):
+        """Watch a directory, raising OSError unless it vanished in the meantime."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(err, os.strerror(err), str(directory))
+        self._watches[wd] = directory
+
+    def _remove_watches(self, directory: Path):
+        """Stop watching a directory and everything below it."""
+        for wd, watched in list(self._watches.items()):
+            if watched == directory or directory in watched.parents:
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def _resync_watches(self):
+        """Re-establish watches after an overflow may have dropped directory events."""
+        for wd, watched in list(self._watches.items()):
+            if not watched.is_dir():
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+        # Re-adding an existing watch returns the same descriptor, so this is idempotent
+        for root in self.roots:
+            for directory in self._iter_dirs(root):
+                self._add_watch(directory)
+
+    def changes(self) -> Iterator[Optional[Set[Path]]]:
+        """Block and yield each batch of changed (created, modified or removed) paths.
+
+        ``None`` is yielded instead of a batch when events may have been lost.
+        """
+        self.start()
+        if self.uses_inotify:
+            yield from self._inotify_changes()
+        yield from self._poll_changes()
+
+    def _inotify_changes(self) -> Iterator[Optional[Set[Path]]]:
+        """Yield inotify batches until the watcher has to fall back to polling."""
+        try:
+            while True:
+                select.select([self._fd], [], [])
+                changed = set()
+                overflowed = False
+                try:
+                    # Coalesce bursts (editors often write several events per save)
+                    while True:
+                        batch = self._read_events()
+                        if batch is None:
+                            overflowed = True
+                        else:
+                            changed |= batch
+                        ready, _, _ = select.select([self._fd], [], [], self.settle)
+                        if not ready:
+                            break
+                    if overflowed:
+                        self._resync_watches()
+                except OSError as e:
+                    # New directories could not be watched; poll and make callers rescan
+                    self._fall_back_to_polling("cannot watch new directories", e.errno)
+                    yield None
+                    return
+                if overflowed:
+                    yield None
+                elif changed:
+                    yield changed
+        finally:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+                self._watches.clear()
+
+    def _read_events(self) -> Optional[Set[Path]]:
+        """Read pending inotify events and translate them to changed paths, or None on overflow."""
+        data = os.read(self._fd, 64 * 1024)
+        changed = set()
+        overflowed = False
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; callers must rescan rather than trust the batch
+                overflowed = True
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if mask & IN_DELETE_SELF:
+                changed.add(directory)
+                continue
+
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if path.name in IGNORED_DIRS or not self.recursive:
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    for subdir in self._iter_dirs(path):
+                        self._add_watch(subdir)
+                    changed.update(self.iter_files(path))
+                else:
+                    if mask & IN_MOVED_FROM:
+                        # Moved away (possibly out of the tree): the old watches would
+                        # keep reporting events under stale paths
+                        self._remove_watches(path)
+                    changed.add(path)
+                continue
+            changed.add(path)
+        return None if overflowed else changed
+
+    def _snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for root in self.roots:
+            for path in self.iter_files(root):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _poll_changes(self) -> Iterator[Set[Path]]:
+        if self._previous is None:
+            self._previous = self._snapshot()
+        while True:
+            time.sleep(self.poll_interval)
+            current = self._snapshot()
+            changed = {path for path in self._previous.keys() | current.keys()
+                       if self._previous.get(path) != current.get(path)}
+            self._previous = current
+            if changed:
+                yield changed
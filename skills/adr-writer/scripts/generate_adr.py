@@ -12,6 +12,9 @@ import argparse
 from datetime import datetime
 from pathlib import Path
 
+from fs_watch import FileWatcher
+from record_writer import FORMATS, open_writer
+
 
 class ADRGenerator:
     """Generates Architecture Decision Records using the EdgeX template."""
@@ -220,6 +223,98 @@ TODO: Document the final decision and any remaining work.
 
         return errors
 
+    def _watch_scope(self, filepath: str = None):
+        """Get the directory to watch and the single target file, if any."""
+        target = Path(filepath).resolve() if filepath else None
+        watch_dir = target.parent if target else self.output_dir.resolve()
+        return watch_dir, target
+
+    def create_watcher(self, filepath: str = None) -> FileWatcher:
+        """Create and start a watcher for the ADR directory or a single ADR.
+
+        Start it before validating the baseline passed to ``watch_validation``
+        so that edits made during that pass are still reported.
+        """
+        watch_dir, _ = self._watch_scope(filepath)
+        watcher = FileWatcher([str(watch_dir)], recursive=False)
+        watcher.start()
+        return watcher
+
+    def watch_validation(self, filepath: str = None, watcher: FileWatcher = None,
+                         baseline: dict = None):
+        """Watch the ADR directory and yield validation results for ADRs whose status changed.
+
+        ``baseline`` maps ADR paths to the errors already reported after
+        ``watcher`` was started; both are created here when omitted.
+        """
+        watch_dir, target = self._watch_scope(filepath)
+        if watcher is None:
+            watcher = self.create_watcher(filepath)
+
+        def tracked(path: Path) -> bool:
+            if target is not None:
+                return path == target
+            return path.suffix == '.md' and path.parent == self.output_dir.resolve()
+
+        # Baseline so only changes in status or errors are reported
+        if baseline is not None:
+            results = {Path(path).resolve(): errors for path, errors in baseline.items()}
+        else:
+            results = {}
+            for path in watcher.iter_files(watch_dir):
+                if tracked(path):
+                    results[path] = self.validate_adr(str(path))
+
+        for changed in watcher.changes():
+            if changed is None or watch_dir in changed:
+                # Events were lost or the directory itself went away: recheck everything
+                changed = set(results) | set(watcher.iter_files(watch_dir))
+
+            for path in sorted(changed):
+                if not tracked(path):
+                    continue
+                display_path = filepath if target else str(self.output_dir / path.name)
+                if not path.exists():
+                    if results.pop(path, None) is not None:
+                        yield {'filename': path.name, 'path': display_path,
+                               'status': 'removed', 'errors': []}
+                    continue
+
+                errors = self.validate_adr(str(path))
+                if results.get(path) == errors:
+                    continue
+                results[path] = errors
+                yield {'filename': path.name, 'path': display_path,
+                       'status': 'invalid' if errors else 'valid', 'errors': errors}
+
+
+def _render_adr(record: dict) -> str:
+    return '\n'.join([
+        f"📄 {record['title']}",
+        f"   File: {record['filename']}",
+        f"   Modified: {record['modified'].strftime('%Y-%m-%d %H:%M')}",
+        f"   Path: {record['path']}",
+        "",
+    ])
+
+
+def _render_validation(record: dict) -> str:
+    if record['status'] == 'removed':
+        return f"🗑️  {record['filename']} removed"
+    if record['status'] == 'valid':
+        return f"✅ {record['filename']}"
+    return '\n'.join([f"❌ {record['filename']}"] +
+                     [f"   - {error}" for error in record['errors']])
+
+
+def _render_file_validation(record: dict) -> str:
+    if record['status'] == 'removed':
+        return f"🗑️  {record['path']} removed"
+    if record['status'] == 'valid':
+        return f"✅ {record['path']} is valid!"
+    return '\n'.join([f"❌ Validation errors in {record['path']}:"] +
+                     [f"   - {error}" for error in record['errors']])
+
 
 def main():
     parser = argparse.ArgumentParser(description="Generate Architecture Decision Records")
@@ -233,9 +328,16 @@ def main():
     parser.add_argument("--file", help="File to validate (for validate command)")
     parser.add_argument("--interactive", action="store_true",
                        help="Interactive mode for filling sections")
+    parser.add_argument("--watch", action="store_true",
+                       help="Keep running and revalidate ADRs as they change (for validate command)")
+    parser.add_argument("--format", choices=FORMATS, default="text",
+                       help="Output format for list and validate: human text, a JSON array, or JSON Lines")
 
     args = parser.parse_args()
 
+    if args.watch and args.format == "json":
+        parser.error("--watch never finishes, so its output cannot be one JSON array; use --format jsonl")
+
     generator = ADRGenerator(args.output)
 
     if args.command == "create":
@@ -254,50 +356,67 @@ def main():
         print(f"2. Fill in all sections and remove TODO items")
         print(f"3. Review with stakeholders")
         print(f"4. Update change log when approved")
-
-    elif args.command == "list":
-        adrs = generator.list_adrs()
-        if not adrs:
-            print(f"No ADRs found in {args.output}")
+        return
+
+    renderers = {
+        'adr': _render_adr,
+        'validation': _render_file_validation if args.file else _render_validation,
+    }
+    with open_writer(args.format, renderers) as writer:
+        if args.command == "list":
+            list_records(generator, args, writer)
         else:
-            print(f"Architecture Decision Records in {args.output}:")
-            print()
-            for adr in adrs:
-                print(f"📄 {adr['title']}")
-                print(f"   File: {adr['filename']}")
-                print(f"   Modified: {adr['modified'].strftime('%Y-%m-%d %H:%M')}")
-                print(f"   Path: {adr['path']}")
-                print()
-
-    elif args.command == "validate":
-        if not args.file:
-            # Validate all ADRs
-            adrs = generator.list_adrs()
-            all_valid = True
-
-            for adr in adrs:
-                errors = generator.validate_adr(adr['path'])
-                if errors:
-                    print(f"❌ {adr['filename']}")
-                    for error in errors:
-                        print(f"   - {error}")
-                    all_valid = False
-                else:
-                    print(f"✅ {adr['filename']}")
-
-            if all_valid:
-                print("\nAll ADRs are valid!")
-            else:
-                print("\nSome ADRs have validation errors.")
+            validate_records(generator, args, writer)
+
+
+def list_records(generator: ADRGenerator, args, writer):
+    """Send every ADR in the output directory to the writer."""
+    adrs = generator.list_adrs()
+    if not adrs:
+        writer.message(f"No ADRs found in {args.output}")
+        return
+
+    writer.message(f"Architecture Decision Records in {args.output}:")
+    writer.message()
+    for adr in adrs:
+        writer.write('adr', **adr)
+
+
+def validate_records(generator: ADRGenerator, args, writer):
+    """Validate one or all ADRs, then optionally keep watching, sending results to the writer."""
+    # Start watching before listing and validating so the printed results can
+    # serve as the watch baseline without missing edits made in between
+    watcher = generator.create_watcher(args.file) if args.watch else None
+
+    if args.file:
+        paths = [(Path(args.file).name, args.file)]
+    else:
+        paths = [(adr['filename'], adr['path']) for adr in generator.list_adrs()]
+
+    all_valid = True
+    baseline = {}
+    for filename, path in paths:
+        errors = generator.validate_adr(path)
+        if os.path.exists(path):
+            baseline[path] = errors
+        all_valid = all_valid and not errors
+        writer.write('validation', filename=filename, path=path,
+                     status='invalid' if errors else 'valid', errors=errors)
+
+    if not args.file:
+        if all_valid:
+            writer.message("\nAll ADRs are valid!")
         else:
-            errors = generator.validate_adr(args.file)
-            if errors:
-                print(f"❌ Validation errors in {args.file}:")
-                for error in errors:
-                    print(f"   - {error}")
-            else:
-                print(f"✅ {args.file} is valid!")
+            writer.message("\nSome ADRs have validation errors.")
+
+    if args.watch:
+        writer.message(f"\nWatching {args.output} for changes (Ctrl+C to stop)...")
+        try:
+            for result in generator.watch_validation(args.file, watcher, baseline):
+                writer.write('validation', **result)
+        except KeyboardInterrupt:
+            pass
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Structured Record Output for ADR Tooling
+
+This module streams result records as JSON Lines or as a single JSON array,
+writing each record as soon as it is produced so consumers can process large
+results incrementally instead of scraping human-readable text. The same
+records can be rendered as text, so every command has a single code path.
+"""
+
+import sys
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, TextIO
+
+FORMATS = ['text', 'json', 'jsonl']
+
+
+def _default(value: Any) -> Any:
+    """Serialize values json does not handle natively."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+class RecordWriter:
+    """Writes records in json (streamed array) or jsonl format."""
+
+    def __init__(self, fmt: str = 'jsonl', stream: TextIO = None):
+        if fmt not in ('json', 'jsonl'):
+            raise ValueError(f"Unsupported structured format: {fmt}")
+        self.fmt = fmt
+        self.stream = stream or sys.stdout
+        self._count = 0
+        self._closed = False
+
+    def message(self, text: str = '') -> None:
+        """Ignore human-oriented messages such as headings and summaries."""
+
+    def write(self, record_type: str, **fields) -> None:
+        """Write one record tagged with its type and flush it immediately."""
+        record: Dict[str, Any] = {'type': record_type}
+        record.update(fields)
+        encoded = json.dumps(record, default=_default, ensure_ascii=False)
+
+        if self.fmt == 'jsonl':
+            self.stream.write(encoded + '\n')
+        else:
+            self.stream.write(('[\n' if self._count == 0 else ',\n') + encoded)
+        self._count += 1
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Terminate the output; for json this closes the array."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.fmt == 'json':
+            self.stream.write('[]\n' if self._count == 0 else '\n]\n')
+            self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class TextWriter:
+    """Renders records as human-readable text using per-type renderers."""
+
+    def __init__(self, renderers: Dict[str, Callable[[Dict[str, Any]], str]],
+                 stream: TextIO = None):
+        self.renderers = renderers
+        self.stream = stream or sys.stdout
+
+    def message(self, text: str = '') -> None:
+        """Print a heading, summary or other line that is not a record."""
+        self.stream.write(text + '\n')
+        self.stream.flush()
+
+    def write(self, record_type: str, **fields) -> None:
+        """Render one record and flush it; renderers may return None to print nothing."""
+        text = self.renderers[record_type](fields)
+        if text is not None:
+            self.message(text)
+
+    def close(self) -> None:
+        """Nothing to terminate for text output."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def open_writer(fmt: str, renderers: Dict[str, Callable[[Dict[str, Any]], str]]):
+    """Create the writer for an output format; text uses the given renderers."""
+    if fmt == 'text':
+        return TextWriter(renderers)
+    return RecordWriter(fmt)